@@ -0,0 +1,315 @@
+import pandas as pd
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from datetime import datetime
+import html
+import re
+
+# -------------------------
+# Report layout
+# -------------------------
+# (column, header, PDF width in mm) — widths sum to the landscape A4 printable width
+SUMMARY_COLUMNS = [
+    ("database", "Database", 48),
+    ("schema", "Schema", 28),
+    ("fabric", "Fabric", 16),
+    ("status", "Status", 28),
+    ("review_table", "Review Table", 55),
+    ("latest_table", "Latest Table", 55),
+    ("review_row_count", "Review Rows", 14),
+    ("latest_row_count", "Latest Rows", 14),
+    ("checked_at", "Checked At", 19),
+]
+ALERT_COLUMNS = [
+    ("database", "Database", 58),
+    ("schema", "Schema", 32),
+    ("alert_type", "Alert", 60),
+    ("message", "Message", 92),
+    ("timestamp", "Timestamp", 35),
+]
+ROLLUP_STATUS_COLUMNS = [("status", "Status", 60), ("count", "Schemas", 25)]
+ROLLUP_FABRIC_COLUMNS = [("fabric", "Fabric", 40), ("status", "Status", 60), ("count", "Schemas", 25)]
+
+# Columns holding comma-joined table lists; only these get a break opportunity after commas
+LIST_COLUMNS = {"review_table", "latest_table"}
+
+ROW_HEIGHT = 5
+FONT_SIZE = 7
+
+# Core PDF fonts are latin-1 only; map the few symbols our messages use
+_PDF_CHAR_MAP = {"→": "->", "±": "+/-", "…": "..."}
+
+def _format_value(val):
+    """
+    Render a single cell value as text ('' for missing values).
+    """
+    if val is None:
+        return ""
+    try:
+        if pd.isna(val):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    if isinstance(val, (datetime, pd.Timestamp)):
+        return val.strftime("%Y-%m-%d %H:%M:%S")
+    return str(val)
+
+def _pdf_text(text, is_list=False):
+    for src, dst in _PDF_CHAR_MAP.items():
+        text = text.replace(src, dst)
+    if is_list:
+        # Let comma-joined table lists wrap between names rather than mid-name
+        text = re.sub(r",(?=\S)", ", ", text)
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+def _iter_rows(df, columns):
+    """
+    Yield one tuple per row restricted to `columns`, in order. Columns missing
+    from df yield empty values. Rows are produced lazily (no per-row dicts).
+    """
+    cols = [c for c, _, _ in columns]
+    if df is None or df.empty:
+        return
+    yield from df.reindex(columns=cols).itertuples(index=False, name=None)
+
+def build_rollups(summary_df):
+    """
+    Return (status_rollup_df, fabric_rollup_df) with schema counts per status
+    and per fabric/status.
+    """
+    if summary_df is None or summary_df.empty:
+        empty = pd.DataFrame(columns=["status", "count"])
+        return empty, pd.DataFrame(columns=["fabric", "status", "count"])
+
+    df = summary_df.reindex(columns=["fabric", "status"]).fillna("")
+    df["fabric"] = df["fabric"].replace("", "N/A")
+    status_rollup = (df.groupby("status").size()
+                     .reset_index(name="count")
+                     .sort_values(["count", "status"], ascending=[False, True]))
+    fabric_rollup = (df.groupby(["fabric", "status"]).size()
+                     .reset_index(name="count")
+                     .sort_values(["fabric", "status"]))
+    return status_rollup, fabric_rollup
+
+# -------------------------
+# PDF renderer
+# -------------------------
+class _ReportPDF(FPDF):
+    def footer(self):
+        self.set_y(-10)
+        self.set_font("Helvetica", size=FONT_SIZE)
+        self.cell(0, ROW_HEIGHT, f"Page {self.page_no()}", align="C")
+
+def _wrap_text(pdf, text, width):
+    """
+    Split text into lines that fit a cell of `width` mm with the current font,
+    breaking on spaces and splitting words that are wider than the cell.
+    (Much cheaper than FPDF.multi_cell's per-character line breaking.)
+    """
+    max_w = width - 2 * pdf.c_margin
+    lines = []
+    for paragraph in text.split("\n"):
+        current = ""
+        for word in paragraph.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if pdf.get_string_width(candidate) <= max_w:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            word_w = pdf.get_string_width(word)
+            while word_w > max_w and len(word) > 1:
+                cut = max(1, int(len(word) * max_w / word_w))
+                while cut > 1 and pdf.get_string_width(word[:cut]) > max_w:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_w = pdf.get_string_width(word)
+            current = word
+        lines.append(current)
+    return lines
+
+def _row_height(cell_lines):
+    return ROW_HEIGHT * max((len(lines) for lines in cell_lines), default=1)
+
+def _pdf_row(pdf, columns, cell_lines, links=None, fill=False):
+    """
+    Draw one table row at the current position from pre-wrapped `cell_lines`
+    (one list of lines per column). All cells share the height of the tallest.
+    `links` optionally maps column name -> hyperlink target.
+    """
+    height = _row_height(cell_lines)
+    x, y = pdf.l_margin, pdf.get_y()
+    for (col, _, width), lines in zip(columns, cell_lines):
+        pdf.rect(x, y, width, height, style="DF" if fill else "D")
+        link = (links or {}).get(col) or ""
+        for i, line in enumerate(lines):
+            pdf.set_xy(x, y + i * ROW_HEIGHT)
+            pdf.cell(width, ROW_HEIGHT, line, link=link)
+        x += width
+    pdf.set_xy(pdf.l_margin, y + height)
+
+def _pdf_header_row(pdf, columns):
+    """
+    Draw the (bold, shaded) header row and return its height.
+    """
+    pdf.set_font("Helvetica", style="B", size=FONT_SIZE)
+    pdf.set_fill_color(220, 220, 220)
+    cell_lines = [_wrap_text(pdf, header, width) for _, header, width in columns]
+    height = _row_height(cell_lines)
+    # Keep the header together with at least one body row
+    if pdf.get_y() + height + ROW_HEIGHT > pdf.page_break_trigger:
+        pdf.add_page()
+    _pdf_row(pdf, columns, cell_lines, fill=True)
+    pdf.set_font("Helvetica", size=FONT_SIZE)
+    return height
+
+def _pdf_table(pdf, title, columns, rows, link_col=None, links=None):
+    """
+    Stream rows into a bordered table, one row at a time. The header row is
+    repeated after every page break, and a row taller than the space left on a
+    page is continued on the next one. Page breaks are handled here, so the
+    document must have auto page break disabled. `links` (optional) yields one
+    target per row; when set, the `link_col` cell becomes a hyperlink to it.
+    """
+    if pdf.get_y() + 8 + 2 * ROW_HEIGHT > pdf.page_break_trigger:
+        pdf.add_page()
+    pdf.set_font("Helvetica", style="B", size=10)
+    pdf.cell(0, 8, title, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    header_h = _pdf_header_row(pdf, columns)
+    # Space for body rows on a fresh page, below the repeated header
+    page_body_h = pdf.page_break_trigger - pdf.t_margin - header_h
+
+    link_iter = iter(links) if links is not None else None
+    row_count = 0
+    for row in rows:
+        target = next(link_iter, "") if link_iter is not None else ""
+        row_links = {link_col: target} if target else None
+        cell_lines = [_wrap_text(pdf, _pdf_text(_format_value(val), col in LIST_COLUMNS), width)
+                      for (col, _, width), val in zip(columns, row)]
+        # Move to a new page if the row does not fit here but would fit on an empty page
+        row_h = _row_height(cell_lines)
+        if pdf.get_y() + row_h > pdf.page_break_trigger and row_h <= page_body_h:
+            pdf.add_page()
+            _pdf_header_row(pdf, columns)
+
+        # Draw the row, splitting it across pages when it is taller than the space left
+        while True:
+            fit = int((pdf.page_break_trigger - pdf.get_y()) // ROW_HEIGHT)
+            if fit < 1:
+                pdf.add_page()
+                _pdf_header_row(pdf, columns)
+                continue
+            _pdf_row(pdf, columns, [lines[:fit] or [""] for lines in cell_lines], links=row_links)
+            cell_lines = [lines[fit:] for lines in cell_lines]
+            if not any(cell_lines):
+                break
+            pdf.add_page()
+            _pdf_header_row(pdf, columns)
+        row_count += 1
+
+    if row_count == 0:
+        pdf.cell(0, ROW_HEIGHT, "(none)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(4)
+
+def render_pdf_report(summary_df, alerts_df=None, path="qa_report.pdf"):
+    """
+    Render the final QA report as a paginated PDF: status/fabric rollups,
+    the summary table (schema cells link to the per-schema detail CSV) and
+    all metric alerts.
+    summary_df may carry optional 'fabric' and 'detail_file' columns.
+    """
+    pdf = _ReportPDF(orientation="L", unit="mm", format="A4")
+    # Tables paginate themselves (see _pdf_table); the margin still sets page_break_trigger
+    pdf.set_auto_page_break(auto=False, margin=12)
+    pdf.add_page()
+    pdf.set_font("Helvetica", style="B", size=14)
+    pdf.cell(0, 10, "QA Summary Report", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", size=FONT_SIZE + 1)
+    total = 0 if summary_df is None else len(summary_df)
+    alert_total = 0 if alerts_df is None else len(alerts_df)
+    pdf.cell(0, ROW_HEIGHT,
+             f"Generated {datetime.now():%Y-%m-%d %H:%M:%S} - {total} schema(s), {alert_total} alert(s)",
+             align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(4)
+
+    status_rollup, fabric_rollup = build_rollups(summary_df)
+    _pdf_table(pdf, "Schemas by status", ROLLUP_STATUS_COLUMNS,
+               _iter_rows(status_rollup, ROLLUP_STATUS_COLUMNS))
+    _pdf_table(pdf, "Schemas by fabric", ROLLUP_FABRIC_COLUMNS,
+               _iter_rows(fabric_rollup, ROLLUP_FABRIC_COLUMNS))
+
+    links = None
+    if summary_df is not None and "detail_file" in summary_df.columns:
+        links = (_format_value(v) for v in summary_df["detail_file"])
+    _pdf_table(pdf, "Summary", SUMMARY_COLUMNS, _iter_rows(summary_df, SUMMARY_COLUMNS),
+               link_col="schema", links=links)
+    _pdf_table(pdf, "Metric alerts", ALERT_COLUMNS, _iter_rows(alerts_df, ALERT_COLUMNS))
+
+    pdf.output(path)
+    return path
+
+# -------------------------
+# HTML renderer
+# -------------------------
+_HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 24px; }
+table { border-collapse: collapse; margin-bottom: 24px; }
+th, td { border: 1px solid #bbb; padding: 3px 8px; text-align: left; vertical-align: top; }
+th { background: #ddd; position: sticky; top: 0; }
+tr:nth-child(even) td { background: #f6f6f6; }
+"""
+
+def _html_table(out, title, columns, rows, link_col=None, links=None):
+    """
+    Stream rows into an HTML table, writing each row straight to `out`.
+    """
+    out.write(f"<h2>{html.escape(title)}</h2>\n<table>\n<thead><tr>")
+    out.write("".join(f"<th>{html.escape(header)}</th>" for _, header, _ in columns))
+    out.write("</tr></thead>\n<tbody>\n")
+
+    link_iter = iter(links) if links is not None else None
+    row_count = 0
+    for row in rows:
+        target = next(link_iter, "") if link_iter is not None else ""
+        cells = []
+        for (col, _, _), val in zip(columns, row):
+            text = html.escape(_format_value(val))
+            if target and col == link_col:
+                text = f'<a href="{html.escape(target, quote=True)}">{text}</a>'
+            cells.append(f"<td>{text}</td>")
+        out.write("<tr>" + "".join(cells) + "</tr>\n")
+        row_count += 1
+
+    if row_count == 0:
+        out.write(f'<tr><td colspan="{len(columns)}">(none)</td></tr>\n')
+    out.write("</tbody>\n</table>\n")
+
+def render_html_report(summary_df, alerts_df=None, path="qa_report.html"):
+    """
+    HTML alternative to render_pdf_report with the same sections. Rows are
+    written to the file as they are produced.
+    """
+    total = 0 if summary_df is None else len(summary_df)
+    alert_total = 0 if alerts_df is None else len(alerts_df)
+    status_rollup, fabric_rollup = build_rollups(summary_df)
+
+    links = None
+    if summary_df is not None and "detail_file" in summary_df.columns:
+        links = (_format_value(v) for v in summary_df["detail_file"])
+
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+        out.write(f"<title>QA Summary Report</title>\n<style>{_HTML_STYLE}</style>\n</head>\n<body>\n")
+        out.write("<h1>QA Summary Report</h1>\n")
+        out.write(f"<p>Generated {datetime.now():%Y-%m-%d %H:%M:%S} &mdash; "
+                  f"{total} schema(s), {alert_total} alert(s)</p>\n")
+        _html_table(out, "Schemas by status", ROLLUP_STATUS_COLUMNS,
+                    _iter_rows(status_rollup, ROLLUP_STATUS_COLUMNS))
+        _html_table(out, "Schemas by fabric", ROLLUP_FABRIC_COLUMNS,
+                    _iter_rows(fabric_rollup, ROLLUP_FABRIC_COLUMNS))
+        _html_table(out, "Summary", SUMMARY_COLUMNS, _iter_rows(summary_df, SUMMARY_COLUMNS),
+                    link_col="schema", links=links)
+        _html_table(out, "Metric alerts", ALERT_COLUMNS, _iter_rows(alerts_df, ALERT_COLUMNS))
+        out.write("</body>\n</html>\n")
+    return path
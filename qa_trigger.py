@@ -2,14 +2,15 @@ import pandas as pd
 import snowflake.connector
 from datetime import datetime
 import yaml
-from tabulate import tabulate
-from fpdf import FPDF
+from qa_report import render_pdf_report, render_html_report
 import os
 import smtplib
 from email.message import EmailMessage
 import json
 import ast
 import re
+import argparse
+import time
 
 # -------------------------
 # Helper: email sender
@@ -55,6 +56,15 @@ EMAIL_PASSWORD = "mdey njcz uwky tfgz"
 # Base SQL templates executed once per DB.Schema (file basenames only)
 sql_files = ["qa_date_range.sql", "qa_duplicate.sql", "qa_rowcount.sql"]
 
+# Watch mode: seconds between cohort_metadata polls
+DEFAULT_POLL_INTERVAL = 300
+MIN_POLL_INTERVAL = 30
+# Watch mode: failed QA runs are retried with exponential backoff, up to a cap
+MAX_QA_ATTEMPTS = 5
+MAX_RETRY_BACKOFF = 6 * 3600
+# Watch mode: reconnect after this many consecutive cycles in which every poll failed
+RECONNECT_AFTER_FAILED_POLLS = 3
+
 # Data structures
 qa_summary_list = []
 qa_detailed_grouped = {}
@@ -104,25 +114,59 @@ def _resolve_sql_paths_for_fabric(fabric_norm, base_files):
 # -------------------------
 # Load config & connect
 # -------------------------
-config_df = pd.read_csv("db_schema_config.csv")
-if "Status" not in config_df.columns:
-    config_df["Status"] = ""
-if "Fabric" not in config_df.columns:
-    # Optional column; leaving blank preserves legacy behavior
-    config_df["Fabric"] = ""
+# Per-row run tracking columns ("<cohort_id>@<run_start_time>", see _run_mark):
+#   QA_Run       - latest cohort run whose QA completed cleanly (watch-mode high-water mark)
+#   Notified_Run - latest cohort run the schema owner was emailed about
+RUN_TRACKING_COLUMNS = ["QA_Run", "Notified_Run"]
+
+def _load_config():
+    df = pd.read_csv("db_schema_config.csv")
+    if "Status" not in df.columns:
+        df["Status"] = ""
+    if "Fabric" not in df.columns:
+        # Optional column; leaving blank preserves legacy behavior
+        df["Fabric"] = ""
+    for col in RUN_TRACKING_COLUMNS:
+        df[col] = df[col].fillna("").astype(str) if col in df.columns else ""
+    return df
+
+config_df = _load_config()
 
 with open("sf_config.yaml", "r") as f:
     sf_conf = yaml.safe_load(f)['snowflake']
 
-conn = snowflake.connector.connect(
-    account=sf_conf['account'],
-    user=sf_conf['user'],
-    warehouse=sf_conf['warehouse'],
-    role=sf_conf['role'],
-    authenticator=sf_conf['authenticator']
-)
-cur = conn.cursor()
-print("✅ SSO Login Successful!")
+def _connect():
+    conn = snowflake.connector.connect(
+        account=sf_conf['account'],
+        user=sf_conf['user'],
+        warehouse=sf_conf['warehouse'],
+        role=sf_conf['role'],
+        authenticator=sf_conf['authenticator'],
+        # Keep the SSO session warm so watch mode does not re-authenticate between polls
+        client_session_keep_alive=True
+    )
+    print("✅ SSO Login Successful!")
+    return conn, conn.cursor()
+
+conn, cur = _connect()
+
+def _reconnect():
+    """
+    Replace the global Snowflake connection/cursor (watch mode, after a dropped session).
+    """
+    global conn, cur
+    try:
+        cur.close()
+        conn.close()
+    except Exception:
+        pass
+    conn, cur = _connect()
+
+def _run_mark(cohort_id, run_start_time):
+    """
+    Identify one cohort run as stored in the QA_Run / Notified_Run config columns.
+    """
+    return f"{cohort_id}@{run_start_time}"
 
 # -------------------------
 # Utility: safe parse of table_info (kept for later use)
@@ -194,7 +238,7 @@ def _extract_suffix_from_table_info(table_info):
 
 def get_suffixes_from_metadata_rows(metadata_rows):
     """
-    metadata_rows: list of tuples (cohort_id, status, table_info)
+    metadata_rows: list of tuples (cohort_id, status, table_info[, run_start_time])
     Returns (review_suffix, latest_suffix)
     Logic:
         - review_suffix: first row with status == 'QA'
@@ -277,10 +321,32 @@ def prepare_sql(sql_template, db, schema, review_suffix, latest_suffix):
             .replace("{{REVIEW_SUFFIX}}", review_suffix)
             .replace("{{LATEST_SUFFIX}}", latest_suffix))
 
+# SQL templates are read from disk once and reused across runs / watch cycles
+_sql_template_cache = {}
+
+def _load_sql_template(sql_path):
+    """
+    Return the raw SQL template for sql_path, reading the file only on first use.
+    Read errors propagate to the caller and are not cached.
+    """
+    if sql_path not in _sql_template_cache:
+        with open(sql_path, 'r') as f:
+            _sql_template_cache[sql_path] = f.read()
+    return _sql_template_cache[sql_path]
+
 # -------------------------
 # Main loop: one QA per DB.Schema
 # -------------------------
-for idx, row in config_df.iterrows():
+def run_qa_for_schema(idx, row, force=False):
+    """
+    Run QA once for a single db_schema_config.csv row.
+    Results are appended to qa_summary_list / qa_detailed_grouped and the
+    row's Status is updated in config_df. With force=True, rows already
+    marked 'QA done' are re-checked (used by watch mode for new cohorts).
+    Returns (run_mark, ok) when QA was attempted for a cohort run in status 'QA',
+    where ok is True only if every SQL file executed cleanly (the row's QA_Run is
+    then advanced to run_mark); returns None when QA was not attempted.
+    """
     db = row['Database']
     schema = row['Schema']
     status_flag = row.get('Status', "")
@@ -291,15 +357,15 @@ for idx, row in config_df.iterrows():
     key = f"{db}_{schema}"
     print(f"\n📌 Processing: {db}.{schema} (Fabric: {fabric_val or 'N/A'})")
 
-    # Skip already-done schemas
-    if str(status_flag).strip().lower() == "qa done":
+    # Skip already-done schemas (watch mode forces a re-run when a new cohort lands)
+    if not force and str(status_flag).strip().lower() == "qa done":
         print(f"⏩ Skipping {db}.{schema}, QA already completed earlier")
-        continue
+        return
 
     # Read cohort metadata to decide whether to run QA
     try:
         cur.execute(f"""
-            SELECT cohort_id, status, table_info
+            SELECT cohort_id, status, table_info, run_start_time
             FROM {db}.internal.cohort_metadata
             ORDER BY run_start_time DESC
         """)
@@ -317,7 +383,7 @@ for idx, row in config_df.iterrows():
             "checked_at": datetime.now()
         })
         config_df.at[idx, "Status"] = "ERROR"
-        continue
+        return
 
     if not metadata_rows:
         print(f"⚠️ No cohort metadata found for {db}.{schema}")
@@ -332,17 +398,17 @@ for idx, row in config_df.iterrows():
             "checked_at": datetime.now()
         })
         config_df.at[idx, "Status"] = "NO_METADATA"
-        continue
+        return
 
     # Latest row decides QA
     latest_row = metadata_rows[0]
-    latest_cohort_id, latest_status, latest_tableinfo_raw = latest_row
+    latest_cohort_id, latest_status, latest_tableinfo_raw, latest_run_start = latest_row
 
     prev_row = metadata_rows[1] if len(metadata_rows) > 1 else None
     prev_cohort_id = None
     prev_tableinfo_raw = None
     if prev_row:
-        prev_cohort_id, _, prev_tableinfo_raw = prev_row
+        prev_cohort_id, _, prev_tableinfo_raw, _ = prev_row
 
     # Parse table_info but do not iterate tables (kept for CSV & future use)
     latest_tables = parse_table_info(latest_tableinfo_raw)
@@ -362,10 +428,11 @@ for idx, row in config_df.iterrows():
             "checked_at": datetime.now()
         })
         config_df.at[idx, "Status"] = "Released"
-        continue
+        return
 
     # At this point, run QA once per DB.Schema
     print(f"🔍 Running QA once for schema → {db}.{schema} (cohort:{latest_cohort_id})")
+    run_mark = _run_mark(latest_cohort_id, latest_run_start)
 
     # Prepare qa_detailed_grouped entry
     if key not in qa_detailed_grouped:
@@ -373,7 +440,10 @@ for idx, row in config_df.iterrows():
             "details": [],
             "db": db,
             "schema": schema,
-            "owner_email": owner_email
+            "owner_email": owner_email,
+            "config_idx": idx,
+            "run_mark": run_mark,
+            "qa_ok": False
         }
 
     # Create summary strings (preserve previous CSV layout)
@@ -406,17 +476,17 @@ for idx, row in config_df.iterrows():
             "checked_at": datetime.now()
         })
         config_df.at[idx, "Status"] = "ERROR"
-        continue
+        return run_mark, False
 
     # Resolve SQL files for this fabric (with fallback to root)
     effective_sql_paths = _resolve_sql_paths_for_fabric(fabric_norm, sql_files)
 
     # Execute each SQL file exactly once per schema.
     # SQL files are expected to use {{DB}}, {{SCHEMA}}, {{REVIEW_SUFFIX}} and {{LATEST_SUFFIX}} placeholders.
+    sql_failed = False
     for sql_path in effective_sql_paths:
         try:
-            with open(sql_path, 'r') as f:
-                raw_sql = f.read()
+            raw_sql = _load_sql_template(sql_path)
         except Exception as e:
             print(f"⚠️ Failed to read {sql_path}: {e}")
             qa_detailed_grouped[key]["details"].append({
@@ -428,6 +498,7 @@ for idx, row in config_df.iterrows():
                 "error": f"Failed to read SQL file: {e}",
                 "checked_at": datetime.now()
             })
+            sql_failed = True
             continue
 
         # First replace the DB/SCHEMA and the two suffix placeholders
@@ -444,6 +515,7 @@ for idx, row in config_df.iterrows():
                 "error": f"Failed to prepare SQL: {e}",
                 "checked_at": datetime.now()
             })
+            sql_failed = True
             continue
 
         # Maintain older placeholder replacements as safety (kept for backwards compatibility)
@@ -485,6 +557,7 @@ for idx, row in config_df.iterrows():
                 "error": str(e),
                 "checked_at": datetime.now()
             })
+            sql_failed = True
 
     # After QA run: append summary & update config status
     qa_summary_list.append({
@@ -501,198 +574,439 @@ for idx, row in config_df.iterrows():
     config_df.at[idx, "Status"] = "QA done"
     print(f"✅ Status updated → QA done for {db}.{schema}")
 
-# -------------------------
-# Persist summary & detailed outputs
-# -------------------------
-config_df.to_csv("db_schema_config.csv", index=False)
-print("\n📌 db_schema_config.csv updated with status")
-
-qa_summary_df = pd.DataFrame(qa_summary_list)
-qa_summary_df.to_csv("qa_summary.csv", index=False)
-print("✅ qa_summary.csv generated")
+    if not sql_failed:
+        config_df.at[idx, "QA_Run"] = run_mark
+        qa_detailed_grouped[key]["qa_ok"] = True
+    return run_mark, not sql_failed
 
 # -------------------------
-# Process metrics and alerts and send email per DB.Schema
+# Persist outputs, alerts, emails and final PDF
 # -------------------------
-for key, group in qa_detailed_grouped.items():
-    detail_df = pd.DataFrame(group["details"])
-    detail_df.to_csv(f"{key}.csv", index=False)
-    print(f"📌 Detailed QA saved → {key}.csv")
-
-    alerts = []
-
-    # Helper: resolve the most specific table name present in the row
-    def _resolve_result_table_name(row, default_key):
-        # Prefer explicit column from SQL output if present
-        cand = row.get('TABLE_NAME') or row.get('table_name') or row.get('TABLE') or None
-        if cand and isinstance(cand, str) and cand.strip():
-            return cand
-        # Fallback to what we stored as provenance
-        cand = row.get('tablename')
-        if cand and isinstance(cand, str) and cand.strip():
-            return cand
-        return default_key
-
-    # Helper: friendly table label (optional for readability)
-    def _friendly_table_label(name):
-        try:
-            return name.replace('_', ' ').strip()
-        except Exception:
-            return str(name)
-
-    # Stale date detection across categories
-    stale_buckets = {
-        "INPATIENT DATE": {"latest": None, "previous": None},
-        "NON_INPATIENT SERVICE DATE": {"latest": None, "previous": None},
-        "SERVICE LINE DATE": {"latest": None, "previous": None},
-        "SERVICE DATE": {"latest": None, "previous": None},
-        "RX FILL DATE": {"latest": None, "previous": None},
-    }
-
-    def _assign_stale_value(test_label, result_val):
-        if not isinstance(test_label, str):
-            return
-        t = test_label.upper()
-        try:
-            d = pd.to_datetime(result_val, errors='coerce')
-            d = d.date() if pd.notnull(d) else None
-        except Exception:
-            d = None
-        if d is None:
-            return
-
-        is_latest = "LATEST" in t
-        is_previous = ("PREVIOUS" in t) or ("(PREVIOUS)" in t)
-
-        if "INPATIENT" in t and "DATE" in t:
-            bucket = "INPATIENT DATE"
-        elif "NON_INPATIENT" in t and "SERVICE_DATE" in t:
-            bucket = "NON_INPATIENT SERVICE DATE"
-        elif ("SERVICE_LINE" in t or "SERVICE LINE" in t) and "DATE" in t:
-            bucket = "SERVICE LINE DATE"
-        elif "FILL_DATE" in t:
-            bucket = "RX FILL DATE"
-        elif "SERVICE_DATE" in t:
-            bucket = "SERVICE DATE"
-        else:
-            return
-
-        if is_latest:
-            stale_buckets[bucket]["latest"] = d
-        elif is_previous:
-            stale_buckets[bucket]["previous"] = d
-
-    # Collect stale-date inputs
-    for _, r in detail_df.iterrows():
-        test = r.get('TEST')
-        result = r.get('RESULT')
-        _assign_stale_value(test, result)
-
-    # Evaluate stale per bucket
-    for bucket, vals in stale_buckets.items():
-        latest = vals["latest"]
-        prev = vals["previous"]
-        if latest and prev and latest == prev:
-            alerts.append({
-                "alert_type": f"{bucket} STALE",
-                "message": f"{bucket} SAME → {latest}",
-                "table_name": bucket,
-                "timestamp": datetime.now()
-            })
+def _persist_config_status(row_indices=None):
+    """
+    Write Status and the run tracking columns of the given config_df rows (all
+    rows when None) back to db_schema_config.csv. The file is re-read first so
+    edits made while watch mode is running (new schemas, reset Status values)
+    are kept; only the rows processed in this run are overwritten.
+    """
+    disk_df = pd.read_csv("db_schema_config.csv")
+    if "Fabric" not in disk_df.columns:
+        disk_df["Fabric"] = ""
+    for col in ["Status"] + RUN_TRACKING_COLUMNS:
+        disk_df[col] = disk_df[col].astype(object) if col in disk_df.columns else ""
 
-        # Helper: resolve specific table name for dupe columns (works across KRD/HT/PLAID)
-    def _map_dupe_col_to_table(col_name):
-        cu = str(col_name).upper()
-        # KRD
-        if "NON_INPATIENT" in cu:
-            return "NON_INPATIENT_EVENTS"
-        if "INPATIENT" in cu:
-            return "INPATIENT_EVENTS"
-        if "RX" in cu or "PHARMACY" in cu:
-            # Prefer KRD name; HT still reads well
-            return "PHARMACY_EVENTS"
-        # Encounters/HT
-        if "HEADERS" in cu:
-            return "MEDICAL_HEADERS"
-        if "SERVICE_LINES" in cu or "SERVICE_LINE" in cu:
-            return "MEDICAL_SERVICE_LINES"
-        # PLAID/generic
-        if "MEDICAL" in cu:
-            return "MEDICAL_EVENTS"
-        # Fallback
-        return None
+    rows = config_df if row_indices is None else config_df.loc[sorted(row_indices)]
+    for _, row in rows.iterrows():
+        match = (disk_df["Database"] == row["Database"]) & (disk_df["Schema"] == row["Schema"])
+        for col in ["Status"] + RUN_TRACKING_COLUMNS:
+            disk_df.loc[match, col] = row[col]
 
-    # Duplicate percentage detection (dynamic)
-    dup_pct_cols = [c for c in detail_df.columns
-                    if isinstance(c, str) and c.upper().endswith("DUPLICATE_PERCENTAGE")]
+    disk_df.to_csv("db_schema_config.csv", index=False)
 
-    for col in dup_pct_cols:
-        detail_df[col] = pd.to_numeric(detail_df[col], errors='coerce')
-        dup_rows = detail_df[detail_df[col] > 0]
-        for _, r in dup_rows.iterrows():
-            pct = r[col]
+def finalize_run(row_indices=None):
+    """
+    Write db_schema_config.csv, qa_summary.csv and per-schema detail/alert CSVs,
+    email schema owners and render qa_report.pdf / qa_report.html for the current run.
+    """
+    # -------------------------
+    # Persist summary & detailed outputs
+    # -------------------------
+    _persist_config_status(row_indices)
+    print("\n📌 db_schema_config.csv updated with status")
+
+    qa_summary_df = pd.DataFrame(qa_summary_list)
+    qa_summary_df.to_csv("qa_summary.csv", index=False)
+    print("✅ qa_summary.csv generated")
+
+    # -------------------------
+    # Process metrics and alerts and send email per DB.Schema
+    # -------------------------
+    # Alerts across all schemas, for the final report
+    all_alerts = []
+
+    for key, group in qa_detailed_grouped.items():
+        detail_df = pd.DataFrame(group["details"])
+        detail_df.to_csv(f"{key}.csv", index=False)
+        print(f"📌 Detailed QA saved → {key}.csv")
+
+        alerts = []
+
+        # Helper: resolve the most specific table name present in the row
+        def _resolve_result_table_name(row, default_key):
+            # Prefer explicit column from SQL output if present
+            cand = row.get('TABLE_NAME') or row.get('table_name') or row.get('TABLE') or None
+            if cand and isinstance(cand, str) and cand.strip():
+                return cand
+            # Fallback to what we stored as provenance
+            cand = row.get('tablename')
+            if cand and isinstance(cand, str) and cand.strip():
+                return cand
+            return default_key
+
+        # Helper: friendly table label (optional for readability)
+        def _friendly_table_label(name):
+            try:
+                return name.replace('_', ' ').strip()
+            except Exception:
+                return str(name)
+
+        # Stale date detection across categories
+        stale_buckets = {
+            "INPATIENT DATE": {"latest": None, "previous": None},
+            "NON_INPATIENT SERVICE DATE": {"latest": None, "previous": None},
+            "SERVICE LINE DATE": {"latest": None, "previous": None},
+            "SERVICE DATE": {"latest": None, "previous": None},
+            "RX FILL DATE": {"latest": None, "previous": None},
+        }
 
-            # Prefer mapping from column name; fallback to any per-row table name; else schema provenance
-            mapped_tbl = _map_dupe_col_to_table(col)
-            if mapped_tbl:
-                table_for_row = mapped_tbl
+        def _assign_stale_value(test_label, result_val):
+            if not isinstance(test_label, str):
+                return
+            t = test_label.upper()
+            try:
+                d = pd.to_datetime(result_val, errors='coerce')
+                d = d.date() if pd.notnull(d) else None
+            except Exception:
+                d = None
+            if d is None:
+                return
+
+            is_latest = "LATEST" in t
+            is_previous = ("PREVIOUS" in t) or ("(PREVIOUS)" in t)
+
+            if "INPATIENT" in t and "DATE" in t:
+                bucket = "INPATIENT DATE"
+            elif "NON_INPATIENT" in t and "SERVICE_DATE" in t:
+                bucket = "NON_INPATIENT SERVICE DATE"
+            elif ("SERVICE_LINE" in t or "SERVICE LINE" in t) and "DATE" in t:
+                bucket = "SERVICE LINE DATE"
+            elif "FILL_DATE" in t:
+                bucket = "RX FILL DATE"
+            elif "SERVICE_DATE" in t:
+                bucket = "SERVICE DATE"
             else:
-                table_for_row = _resolve_result_table_name(r, key)
-
-            alerts.append({
-                "alert_type": f"{table_for_row} DUPLICATES",
-                "message": f"Duplicates detected -> {pct:.2f}%",  # ASCII arrow to avoid Excel mojibake
-                "table_name": table_for_row,
-                "timestamp": datetime.now()
-            })
+                return
+
+            if is_latest:
+                stale_buckets[bucket]["latest"] = d
+            elif is_previous:
+                stale_buckets[bucket]["previous"] = d
+
+        # Collect stale-date inputs
+        for _, r in detail_df.iterrows():
+            test = r.get('TEST')
+            result = r.get('RESULT')
+            _assign_stale_value(test, result)
+
+        # Evaluate stale per bucket
+        for bucket, vals in stale_buckets.items():
+            latest = vals["latest"]
+            prev = vals["previous"]
+            if latest and prev and latest == prev:
+                alerts.append({
+                    "alert_type": f"{bucket} STALE",
+                    "message": f"{bucket} SAME → {latest}",
+                    "table_name": bucket,
+                    "timestamp": datetime.now()
+                })
 
-    # Row/Patient delta checks (now labeled with the specific table)
-    delta_cols = [("ROW_DELTA_PCT", "ROW DELTA"), ("PATIENT_DELTA_PCT", "PATIENT DELTA")]
-    for col, base_alert_type in delta_cols:
-        if col in detail_df.columns:
+            # Helper: resolve specific table name for dupe columns (works across KRD/HT/PLAID)
+        def _map_dupe_col_to_table(col_name):
+            cu = str(col_name).upper()
+            # KRD
+            if "NON_INPATIENT" in cu:
+                return "NON_INPATIENT_EVENTS"
+            if "INPATIENT" in cu:
+                return "INPATIENT_EVENTS"
+            if "RX" in cu or "PHARMACY" in cu:
+                # Prefer KRD name; HT still reads well
+                return "PHARMACY_EVENTS"
+            # Encounters/HT
+            if "HEADERS" in cu:
+                return "MEDICAL_HEADERS"
+            if "SERVICE_LINES" in cu or "SERVICE_LINE" in cu:
+                return "MEDICAL_SERVICE_LINES"
+            # PLAID/generic
+            if "MEDICAL" in cu:
+                return "MEDICAL_EVENTS"
+            # Fallback
+            return None
+
+        # Duplicate percentage detection (dynamic)
+        dup_pct_cols = [c for c in detail_df.columns
+                        if isinstance(c, str) and c.upper().endswith("DUPLICATE_PERCENTAGE")]
+
+        for col in dup_pct_cols:
             detail_df[col] = pd.to_numeric(detail_df[col], errors='coerce')
-            delta = detail_df[detail_df[col].abs() > DELTA_THRESHOLD]
-            for _, r in delta.iterrows():
-                table_for_row = _resolve_result_table_name(r, key)
-                # Include table in the alert_type, e.g., "INPATIENT_EVENTS ROW DELTA"
+            dup_rows = detail_df[detail_df[col] > 0]
+            for _, r in dup_rows.iterrows():
+                pct = r[col]
+
+                # Prefer mapping from column name; fallback to any per-row table name; else schema provenance
+                mapped_tbl = _map_dupe_col_to_table(col)
+                if mapped_tbl:
+                    table_for_row = mapped_tbl
+                else:
+                    table_for_row = _resolve_result_table_name(r, key)
+
                 alerts.append({
-                    "alert_type": f"{table_for_row} {base_alert_type}",
-                    "message": f"{_friendly_table_label(table_for_row)} {base_alert_type.lower()} > ±{DELTA_THRESHOLD}% → {r[col]:.2f}%",
+                    "alert_type": f"{table_for_row} DUPLICATES",
+                    "message": f"Duplicates detected -> {pct:.2f}%",  # ASCII arrow to avoid Excel mojibake
                     "table_name": table_for_row,
                     "timestamp": datetime.now()
                 })
 
-    # Write metric alerts
-    attachments = [f"{key}.csv"]
-    if alerts:
-        metric_file = f"metric_{key}.csv"
-        pd.DataFrame(alerts).to_csv(metric_file, index=False)
-        attachments.append(metric_file)
-        print(f"🚨 Metric alerts generated → {metric_file}")
-
-    # SEND EMAIL to correct schema owner
-    owner_email = group.get("owner_email")
-    db = group.get("db")
-    schema = group.get("schema")
-    if owner_email:
-        subject = f"QA Report & Alerts for {db}.{schema}"
-        body = f"Hi,\n\nPlease find attached the QA summary and any metric alerts for {db}.{schema}.\n\nRegards,\nQA Automation"
-        send_email(owner_email, subject, body, attachments=attachments)
+        # Row/Patient delta checks (now labeled with the specific table)
+        delta_cols = [("ROW_DELTA_PCT", "ROW DELTA"), ("PATIENT_DELTA_PCT", "PATIENT DELTA")]
+        for col, base_alert_type in delta_cols:
+            if col in detail_df.columns:
+                detail_df[col] = pd.to_numeric(detail_df[col], errors='coerce')
+                delta = detail_df[detail_df[col].abs() > DELTA_THRESHOLD]
+                for _, r in delta.iterrows():
+                    table_for_row = _resolve_result_table_name(r, key)
+                    # Include table in the alert_type, e.g., "INPATIENT_EVENTS ROW DELTA"
+                    alerts.append({
+                        "alert_type": f"{table_for_row} {base_alert_type}",
+                        "message": f"{_friendly_table_label(table_for_row)} {base_alert_type.lower()} > ±{DELTA_THRESHOLD}% → {r[col]:.2f}%",
+                        "table_name": table_for_row,
+                        "timestamp": datetime.now()
+                    })
+
+        # Write metric alerts
+        attachments = [f"{key}.csv"]
+        if alerts:
+            metric_file = f"metric_{key}.csv"
+            pd.DataFrame(alerts).to_csv(metric_file, index=False)
+            attachments.append(metric_file)
+            print(f"🚨 Metric alerts generated → {metric_file}")
+            all_alerts.extend({"database": group.get("db"), "schema": group.get("schema"), **a} for a in alerts)
+
+        # SEND EMAIL to correct schema owner
+        # (a failed retry of a run the owner was already emailed about is not re-sent)
+        owner_email = group.get("owner_email")
+        db = group.get("db")
+        schema = group.get("schema")
+        run_mark = group.get("run_mark")
+        config_idx = group.get("config_idx")
+        already_notified = (not group.get("qa_ok")
+                            and config_df.at[config_idx, "Notified_Run"] == run_mark)
+        if owner_email and already_notified:
+            print(f"✉️ Skipping email for {db}.{schema}: owner already notified about run {run_mark}")
+        elif owner_email:
+            subject = f"QA Report & Alerts for {db}.{schema}"
+            body = f"Hi,\n\nPlease find attached the QA summary and any metric alerts for {db}.{schema}.\n\nRegards,\nQA Automation"
+            send_email(owner_email, subject, body, attachments=attachments)
+            config_df.at[config_idx, "Notified_Run"] = run_mark
+
+    # Record which runs owners were notified about
+    _persist_config_status(row_indices)
+
+    # -------------------------
+    # Final report (PDF + HTML)
+    # -------------------------
+    # Report-only columns: fabric for rollups and the per-schema detail CSV to link to
+    report_df = qa_summary_df.copy()
+    if not report_df.empty:
+        fabric_lookup = {(r["Database"], r["Schema"]): str(r["Fabric"]).strip() if pd.notna(r["Fabric"]) else ""
+                         for _, r in config_df.iterrows()}
+        report_df["fabric"] = [fabric_lookup.get((d, sc), "")
+                               for d, sc in zip(report_df["database"], report_df["schema"])]
+        report_df["detail_file"] = [f"{d}_{sc}.csv" if f"{d}_{sc}" in qa_detailed_grouped else ""
+                                    for d, sc in zip(report_df["database"], report_df["schema"])]
+    alerts_df = pd.DataFrame(all_alerts)
+
+    render_pdf_report(report_df, alerts_df, "qa_report.pdf")
+    render_html_report(report_df, alerts_df, "qa_report.html")
+    print("📄 qa_report.pdf and qa_report.html generated")
 
 # -------------------------
-# Final PDF summary
+# Batch run & watch mode
 # -------------------------
-pdf = FPDF()
-pdf.add_page()
-pdf.set_font("Courier", size=10)
-pdf.cell(200, 10, "QA Summary Report", ln=True, align='C')
-pdf.ln(5)
+def run_batch(row_indices=None, force=False):
+    """
+    Run QA for the given config_df row indices (all rows when None), then persist
+    outputs and send reports. Per-run accumulators are reset first so that watch
+    cycles only report the cohorts they processed.
+    Returns {row index: (run_mark, ok)} for each row QA was attempted on
+    (see run_qa_for_schema).
+    """
+    qa_summary_list.clear()
+    qa_detailed_grouped.clear()
+
+    processed = {}
+    for idx, row in config_df.iterrows():
+        if row_indices is not None and idx not in row_indices:
+            continue
+        result = run_qa_for_schema(idx, row, force=force)
+        if result:
+            processed[idx] = result
+
+    finalize_run(row_indices)
+    return processed
+
+def _reload_config():
+    """
+    Re-read db_schema_config.csv so watch mode picks up schemas added (or
+    Status values reset) while it is running.
+    """
+    global config_df
+    config_df = _load_config()
+
+def poll_latest_cohort(db):
+    """
+    Cheap poll of {db}.internal.cohort_metadata: fetch only the newest row.
+    Returns (cohort_id, status, run_start_time) or None when the table is empty.
+    """
+    cur.execute(f"""
+        SELECT cohort_id, status, run_start_time
+        FROM {db}.internal.cohort_metadata
+        ORDER BY run_start_time DESC
+        LIMIT 1
+    """)
+    return cur.fetchone()
+
+def _adopt_current_runs_for_done_rows():
+    """
+    Rows marked 'QA done' before run tracking existed have no QA_Run. Treat the
+    cohort run currently in 'QA' as already handled (and notified) for them, so
+    only a newer run triggers QA again. Only applies to a config file written
+    before the tracking columns were added; afterwards an empty QA_Run means
+    the last QA attempt failed and must be retried.
+    """
+    if "QA_Run" in pd.read_csv("db_schema_config.csv", nrows=0).columns:
+        return
+
+    legacy = config_df[(config_df["Status"].astype(str).str.strip().str.lower() == "qa done")
+                       & (config_df["QA_Run"] == "")]
+    for db, rows in legacy.groupby("Database"):
+        try:
+            latest = poll_latest_cohort(db)
+        except Exception as e:
+            print(f"⚠️ Failed to poll cohort_metadata for {db}.internal: {e}")
+            continue
+        if not latest or str(latest[1]).strip() != "QA":
+            continue
+        run_mark = _run_mark(latest[0], latest[2])
+        for idx in rows.index:
+            config_df.at[idx, "QA_Run"] = run_mark
+            config_df.at[idx, "Notified_Run"] = run_mark
+        print(f"ℹ️ Recorded run {run_mark} as already QA'd for {len(rows)} 'QA done' schema(s) in {db}")
+
+def watch(interval=DEFAULT_POLL_INTERVAL):
+    """
+    Long-running mode: do one normal batch run, then poll cohort_metadata per DB
+    every `interval` seconds. When a DB's newest row has status 'QA', QA is run for
+    each of its schemas whose QA_Run high-water mark (persisted in
+    db_schema_config.csv) is a different run. Failed runs are retried with
+    exponential backoff up to MAX_QA_ATTEMPTS times. The config is re-read every
+    cycle; the Snowflake session and SQL templates are reused and the session is
+    re-established after repeated poll failures.
+    """
+    # (Database, Schema) -> {"run": run_mark, "attempts": n, "next_at": epoch seconds}
+    retry_state = {}
+    failed_poll_cycles = 0
 
-for line in tabulate(qa_summary_df, headers='keys', tablefmt='grid').split('\n'):
-    pdf.multi_cell(0, 5, line)
+    try:
+        _adopt_current_runs_for_done_rows()
+        run_batch()
+    except Exception as e:
+        print(f"⚠️ Initial QA run failed: {e}")
 
-pdf.output("qa_report.pdf")
+    print(f"\n👀 Watching cohort_metadata every {interval}s (Ctrl+C to stop)")
+    while True:
+        time.sleep(interval)
 
-cur.close()
-conn.close()
-print("\n🎯 QA Execution Completed Successfully ✅")
\ No newline at end of file
+        try:
+            _reload_config()
+
+            # Row index -> cohort run it should be QA'd for
+            pending = {}
+            polled_any = False
+            for db in config_df["Database"].unique():
+                try:
+                    latest = poll_latest_cohort(db)
+                except Exception as e:
+                    print(f"⚠️ Failed to poll cohort_metadata for {db}.internal: {e}")
+                    continue
+                polled_any = True
+                if not latest or str(latest[1]).strip() != "QA":
+                    continue
+                run_mark = _run_mark(latest[0], latest[2])
+                for idx, row in config_df[config_df["Database"] == db].iterrows():
+                    if row["QA_Run"] == run_mark:
+                        continue
+                    state = retry_state.get((db, row["Schema"]))
+                    if state and state["run"] == run_mark and (
+                            state["attempts"] >= MAX_QA_ATTEMPTS or time.time() < state["next_at"]):
+                        continue
+                    pending[idx] = run_mark
+
+            if polled_any:
+                failed_poll_cycles = 0
+            else:
+                failed_poll_cycles += 1
+                if failed_poll_cycles >= RECONNECT_AFTER_FAILED_POLLS:
+                    print("🔌 All polls failing; re-establishing Snowflake connection")
+                    failed_poll_cycles = 0
+                    _reconnect()
+
+            if not pending:
+                continue
+
+            print(f"🆕 QA pending for {len(pending)} schema(s)")
+            processed = run_batch(row_indices=set(pending), force=True)
+
+            for idx, polled_mark in pending.items():
+                state_key = (config_df.at[idx, "Database"], config_df.at[idx, "Schema"])
+                run_mark, ok = processed.get(idx, (polled_mark, False))
+                if ok:
+                    retry_state.pop(state_key, None)
+                    continue
+                state = retry_state.get(state_key)
+                attempts = state["attempts"] + 1 if state and state["run"] == run_mark else 1
+                delay = min(interval * 2 ** attempts, MAX_RETRY_BACKOFF)
+                retry_state[state_key] = {"run": run_mark, "attempts": attempts, "next_at": time.time() + delay}
+                if attempts >= MAX_QA_ATTEMPTS:
+                    print(f"⚠️ QA failed {attempts}x for {'.'.join(state_key)} run {run_mark}; "
+                          f"giving up until a newer run lands")
+                else:
+                    print(f"⚠️ QA incomplete for {'.'.join(state_key)} run {run_mark}; retrying in {delay}s")
+        except Exception as e:
+            print(f"⚠️ Watch cycle failed, will retry on next poll: {e}")
+
+# -------------------------
+# Entry point
+# -------------------------
+def _poll_interval(value):
+    """
+    argparse type for --interval: an integer number of seconds >= MIN_POLL_INTERVAL.
+    """
+    try:
+        seconds = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid interval '{value}': must be an integer number of seconds")
+    if seconds < MIN_POLL_INTERVAL:
+        raise argparse.ArgumentTypeError(f"interval must be at least {MIN_POLL_INTERVAL} seconds (got {seconds})")
+    return seconds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run schema QA for cohorts listed in db_schema_config.csv")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and trigger QA as soon as a new cohort run reaches status 'QA' "
+                             "(db_schema_config.csv is re-read every poll)")
+    parser.add_argument("--interval", type=_poll_interval, default=DEFAULT_POLL_INTERVAL,
+                        help=f"seconds between cohort_metadata polls in watch mode "
+                             f"(default: {DEFAULT_POLL_INTERVAL}, minimum: {MIN_POLL_INTERVAL})")
+    args = parser.parse_args()
+
+    try:
+        if args.watch:
+            watch(interval=args.interval)
+        else:
+            run_batch()
+            print("\n🎯 QA Execution Completed Successfully ✅")
+    except KeyboardInterrupt:
+        print("\n🛑 Watch mode stopped")
+    finally:
+        cur.close()
+        conn.close()